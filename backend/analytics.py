@@ -0,0 +1,181 @@
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Integer, String, literal, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+from cache import VersionedCache
+from models import Content, Like, Rating
+
+# Results are reused for the rest of the time bucket they were computed in
+ANALYTICS_CACHE_SECONDS = int(os.getenv("ANALYTICS_CACHE_SECONDS", "300"))
+
+# Upload age buckets, in days
+AGE_BUCKET_EDGES = [0, 7, 30, 90, 180, 365, np.inf]
+AGE_BUCKET_LABELS = ["0-7", "8-30", "31-90", "91-180", "181-365", "365+"]
+
+analytics_cache = VersionedCache("analytics")
+
+
+def _to_naive_utc(values: pd.Series) -> pd.Series:
+    # SQLite hands back naive UTC timestamps, other backends aware ones
+    return pd.to_datetime(values, utc=True, format="ISO8601").dt.tz_localize(None)
+
+
+def _load_frames(db: Session, since: datetime, category: Optional[str], content_id: Optional[int]):
+    content_stmt = select(Content.id, Content.category, Content.upload_date)
+    if category:
+        content_stmt = content_stmt.where(Content.category == category)
+    if content_id is not None:
+        content_stmt = content_stmt.where(Content.id == content_id)
+    content = pd.DataFrame(
+        db.execute(content_stmt).all(), columns=["content_id", "category", "upload_date"]
+    )
+
+    # Likes and ratings come back together as three narrow columns; likes have no score.
+    # Timestamps skip SQLAlchemy's per-row datetime parsing and are parsed by pandas instead.
+    likes = select(
+        Like.content_id, type_coerce(Like.created_at, String), literal(None, Integer).label("score")
+    ).where(Like.created_at >= since)
+    ratings = select(
+        Rating.content_id, type_coerce(Rating.created_at, String), Rating.score
+    ).where(Rating.created_at >= since)
+    if category or content_id is not None:
+        scoped_ids = content_stmt.with_only_columns(Content.id)
+        likes = likes.where(Like.content_id.in_(scoped_ids))
+        ratings = ratings.where(Rating.content_id.in_(scoped_ids))
+    votes = pd.DataFrame(
+        db.execute(union_all(likes, ratings)).all(),
+        columns=["content_id", "created_at", "score"],
+    )
+
+    content["upload_date"] = _to_naive_utc(content["upload_date"])
+    votes["created_at"] = _to_naive_utc(votes["created_at"])
+    votes["score"] = pd.to_numeric(votes["score"]).astype(np.float64)
+    return content, votes
+
+
+def _daily_series(votes: pd.DataFrame, since: datetime, now: datetime) -> dict:
+    days = pd.date_range(pd.Timestamp(since).floor("D"), pd.Timestamp(now).floor("D"), freq="D")
+    is_rating = votes["score"].notna()
+    grouped = pd.DataFrame({
+        "day": votes["created_at"].dt.floor("D"),
+        "like": (~is_rating).astype(np.int64),
+        "rating": is_rating.astype(np.int64),
+        "score": votes["score"],
+    }).groupby("day").agg(
+        likes=("like", "sum"), ratings=("rating", "sum"), average_rating=("score", "mean")
+    ).reindex(days)
+
+    average = grouped["average_rating"].round(2).to_numpy()
+    return {
+        "dates": [day.strftime("%Y-%m-%d") for day in days],
+        "likes": grouped["likes"].fillna(0).astype(np.int64).tolist(),
+        "ratings": grouped["ratings"].fillna(0).astype(np.int64).tolist(),
+        "average_rating": [None if np.isnan(value) else float(value) for value in average],
+    }
+
+
+def _rating_distribution(votes: pd.DataFrame) -> list:
+    scores = votes["score"].dropna().to_numpy(dtype=np.int64)
+    scores = scores[(scores >= 1) & (scores <= 5)]
+    return np.bincount(scores, minlength=6)[1:6].tolist()
+
+
+def _per_content_counts(content: pd.DataFrame, votes: pd.DataFrame) -> pd.DataFrame:
+    is_rating = votes["score"].notna()
+    counts = pd.DataFrame({
+        "content_id": votes["content_id"],
+        "likes": (~is_rating).astype(np.int64),
+        "ratings": is_rating.astype(np.int64),
+        "score_sum": votes["score"].fillna(0),
+    }).groupby("content_id").sum()
+    merged = content.set_index("content_id").join(counts, how="left")
+    merged[["likes", "ratings", "score_sum"]] = merged[["likes", "ratings", "score_sum"]].fillna(0)
+    return merged
+
+
+def _per_category(per_content: pd.DataFrame) -> list:
+    grouped = per_content.groupby("category").agg(
+        items=("likes", "size"), likes=("likes", "sum"), ratings=("ratings", "sum"), score_sum=("score_sum", "sum")
+    )
+    average = np.divide(
+        grouped["score_sum"].to_numpy(), grouped["ratings"].to_numpy(),
+        out=np.zeros(len(grouped)), where=grouped["ratings"].to_numpy() > 0,
+    )
+    return [
+        {
+            "category": category,
+            "items": int(row["items"]),
+            "likes": int(row["likes"]),
+            "ratings": int(row["ratings"]),
+            "average_rating": round(float(avg), 2),
+        }
+        for (category, row), avg in zip(grouped.iterrows(), average)
+    ]
+
+
+def _engagement_by_age(per_content: pd.DataFrame, now: datetime, days: int) -> list:
+    age_days = (pd.Timestamp(now) - per_content["upload_date"]).dt.days.clip(lower=0)
+    engagement = per_content["likes"] + per_content["ratings"]
+    # Votes are only counted inside the window, so older items are only exposed for `days` of it
+    exposure_days = np.minimum(age_days, days) + 1
+    buckets = pd.cut(age_days, AGE_BUCKET_EDGES, labels=AGE_BUCKET_LABELS, include_lowest=True)
+    grouped = pd.DataFrame({
+        "bucket": buckets,
+        "engagement": engagement,
+        # Per day in the window, so new uploads are not penalised for having had less time
+        "rate": engagement / exposure_days,
+    }).groupby("bucket", observed=False).agg(
+        items=("engagement", "size"), engagement=("engagement", "mean"), rate=("rate", "mean")
+    ).fillna(0)
+    return [
+        {
+            "age_days": label,
+            "items": int(row["items"]),
+            "average_engagement": round(float(row["engagement"]), 2),
+            "engagement_per_day": round(float(row["rate"]), 4),
+        }
+        for label, row in grouped.iterrows()
+    ]
+
+
+def compute_engagement(
+    db: Session,
+    days: int = 365,
+    category: Optional[str] = None,
+    content_id: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """Daily likes/ratings, rating distribution and engagement by upload age"""
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=days)
+    content, votes = _load_frames(db, since, category, content_id)
+    per_content = _per_content_counts(content, votes)
+    return {
+        "days": days,
+        "category": category,
+        "content_id": content_id,
+        "generated_at": now,
+        "daily": _daily_series(votes, since, now),
+        "rating_distribution": _rating_distribution(votes),
+        "categories": _per_category(per_content),
+        "engagement_by_age": _engagement_by_age(per_content, now, days),
+    }
+
+
+def get_engagement(
+    db: Session,
+    days: int = 365,
+    category: Optional[str] = None,
+    content_id: Optional[int] = None,
+) -> dict:
+    bucket = int(time.time() // ANALYTICS_CACHE_SECONDS)
+    return analytics_cache.get_or_set(
+        (days, category, content_id, bucket),
+        lambda: compute_engagement(db, days, category, content_id),
+    )
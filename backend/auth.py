@@ -1,7 +1,5 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.hash import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -20,13 +18,20 @@ ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
 
 security = HTTPBearer()
 
+# passlib and jose are imported inside the functions that need them so that
+# importing this module (and every worker boot) stays cheap
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    from passlib.hash import bcrypt
     return bcrypt.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
+    from passlib.hash import bcrypt
     return bcrypt.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
+    
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -38,6 +43,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[schemas.TokenData]:
+    from jose import JWTError, jwt
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -0,0 +1,345 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import IO, Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, Table, insert, select
+from sqlalchemy.exc import IntegrityError, StatementError
+from sqlalchemy.orm import Session
+
+from models import Content, Like, Rating
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+
+BULK_TABLES: Dict[str, Table] = {
+    "content": Content.__table__,
+    "likes": Like.__table__,
+    "ratings": Rating.__table__,
+}
+
+# Cache namespaces to invalidate after an import. Imported votes can carry ids
+# below the recommendation index watermarks, so the index is rebuilt too.
+IMPORT_INVALIDATES = ("content", "categories", "analytics", "recommendations")
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class BulkError(ValueError):
+    """Raised for unknown tables/formats and malformed import data"""
+
+
+def get_table(name: str) -> Table:
+    if name not in BULK_TABLES:
+        raise BulkError(f"Unknown table '{name}', expected one of {', '.join(BULK_TABLES)}")
+    return BULK_TABLES[name]
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in EXPORT_FORMATS:
+        raise BulkError(f"Unknown format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def iter_chunks(db: Session, table: Table, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Stream a table in primary-key order, chunk_size rows at a time"""
+    stmt = select(table).order_by(*table.primary_key.columns)
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    for partition in result.mappings().partitions():
+        yield [dict(row) for row in partition]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _export_ndjson(table: Table, chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in chunk
+        ).encode()
+
+
+def _export_csv(table: Table, chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[column.name for column in table.columns])
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator.
+
+    Tracks its own position so Parquet footer offsets stay correct after the
+    buffer has been drained.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _parquet_schema(table: Table):
+    import pyarrow as pa
+
+    def arrow_type(column):
+        if isinstance(column.type, Boolean):
+            return pa.bool_()
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us")
+        return pa.string()
+
+    return pa.schema([(column.name, arrow_type(column)) for column in table.columns])
+
+
+def _export_parquet(table: Table, chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise BulkError("Parquet export requires pyarrow")
+
+    schema = _parquet_schema(table)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        # One row group per chunk keeps memory flat regardless of table size
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_EXPORTERS = {
+    "ndjson": _export_ndjson,
+    "csv": _export_csv,
+    "parquet": _export_parquet,
+}
+
+
+def export_table(db: Session, table_name: str, fmt: str = "ndjson", chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode a whole table as a stream of byte chunks at constant memory"""
+    table = get_table(table_name)
+    _check_format(fmt)
+    return _EXPORTERS[fmt](table, iter_chunks(db, table, chunk_size))
+
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def _read_ndjson(stream: IO[bytes]) -> Iterator[dict]:
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise BulkError(f"Invalid JSON on line {line_number}: {exc.msg}")
+        except UnicodeDecodeError:
+            raise BulkError(f"Line {line_number} is not valid UTF-8")
+
+
+def _read_csv(stream: IO[bytes]) -> Iterator[dict]:
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+    try:
+        yield from reader
+    except UnicodeDecodeError:
+        raise BulkError(f"CSV is not valid UTF-8 (after line {reader.line_num})")
+    except csv.Error as exc:
+        raise BulkError(f"Invalid CSV on line {reader.line_num}: {exc}")
+
+
+def _read_parquet(stream: IO[bytes]) -> Iterator[dict]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise BulkError("Parquet import requires pyarrow")
+
+    try:
+        batches = pq.ParquetFile(stream).iter_batches(batch_size=IMPORT_CHUNK_SIZE)
+        for batch in batches:
+            yield from batch.to_pylist()
+    except pa.ArrowException as exc:
+        raise BulkError(f"Invalid Parquet file: {exc}")
+
+
+_READERS = {
+    "ndjson": _read_ndjson,
+    "csv": _read_csv,
+    "parquet": _read_parquet,
+}
+
+
+def _coerce(column, value):
+    """Convert text values from CSV/NDJSON into what the column type expects.
+
+    Raises TypeError/ValueError for anything the column cannot store, so bad
+    rows are reported here rather than failing inside the INSERT.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(column.type, DateTime):
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+        if not isinstance(value, datetime):
+            raise TypeError(f"expected a timestamp, got {type(value).__name__}")
+        return value
+    if isinstance(column.type, Boolean):
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "t", "yes")
+        if not isinstance(value, (bool, int)):
+            raise TypeError(f"expected a boolean, got {type(value).__name__}")
+        return bool(value)
+    if isinstance(column.type, (Integer, Float)) and isinstance(value, bool):
+        raise TypeError("expected a number, got bool")
+    if isinstance(column.type, Integer) and not isinstance(value, int):
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"expected an integer, got {value}")
+        return int(value)
+    if isinstance(column.type, Float) and not isinstance(value, float):
+        return float(value)
+    if isinstance(column.type, String) and not isinstance(value, str):
+        raise TypeError(f"expected text, got {type(value).__name__}")
+    return value
+
+
+def _prepare_row(table: Table, raw: dict, row_number: int) -> dict:
+    row = {}
+    for column in table.columns:
+        if column.name not in raw:
+            continue
+        try:
+            value = _coerce(column, raw[column.name])
+        except (TypeError, ValueError):
+            raise BulkError(f"Row {row_number}: invalid value for '{column.name}'")
+        # Let server defaults (ids, timestamps) apply instead of inserting NULL
+        if value is None and (
+            column.primary_key or column.default is not None or column.server_default is not None
+        ):
+            continue
+        row[column.name] = value
+
+    # Same rule the rating endpoint applies; the column itself has no check constraint
+    if table is Rating.__table__ and row.get("score") is not None and not 1 <= row["score"] <= 5:
+        raise BulkError(f"Row {row_number}: score must be between 1 and 5")
+    return row
+
+
+def _check_content_ids(db: Session, table: Table, chunk: List[dict], first_row_number: int) -> None:
+    """Reject rows pointing at missing content; SQLite does not enforce the foreign key"""
+    if "content_id" not in table.columns:
+        return
+    content_ids = {row["content_id"] for row in chunk if row.get("content_id") is not None}
+    existing = set(db.scalars(select(Content.id).where(Content.id.in_(content_ids))))
+    for offset, row in enumerate(chunk):
+        if row.get("content_id") is not None and row["content_id"] not in existing:
+            raise BulkError(f"Row {first_row_number + offset}: content {row['content_id']} does not exist")
+
+
+def import_table(
+    db: Session,
+    table_name: str,
+    stream: IO[bytes],
+    fmt: str = "ndjson",
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> int:
+    """Bulk-insert rows read from stream, committing one transaction per chunk.
+
+    Returns the number of rows inserted. On failure the current chunk is
+    rolled back; earlier chunks stay committed.
+    """
+    table = get_table(table_name)
+    _check_format(fmt)
+
+    imported = 0
+    chunk: List[dict] = []
+
+    def flush():
+        nonlocal imported
+        _check_content_ids(db, table, chunk, imported + 1)
+        # Rows in one multi-VALUES insert must share the same keys
+        by_keys: Dict[tuple, List[dict]] = {}
+        for row in chunk:
+            by_keys.setdefault(tuple(row), []).append(row)
+        try:
+            for rows in by_keys.values():
+                db.execute(insert(table).values(rows))
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            raise BulkError(
+                f"Rows {imported + 1}-{imported + len(chunk)} rejected after {imported} imported: {exc.orig}"
+            )
+        except StatementError as exc:
+            # Anything _coerce let through that the driver still refuses
+            db.rollback()
+            raise BulkError(
+                f"Rows {imported + 1}-{imported + len(chunk)} rejected after {imported} imported: "
+                f"{exc.orig if exc.orig is not None else exc}"
+            )
+        except Exception:
+            db.rollback()
+            raise
+        imported += len(chunk)
+        chunk.clear()
+
+    for row_number, raw in enumerate(_READERS[fmt](stream), start=1):
+        if not isinstance(raw, dict):
+            raise BulkError(f"Row {row_number}: expected an object")
+        row = _prepare_row(table, raw, row_number)
+        if not row:
+            raise BulkError(f"Row {row_number}: no known columns for table '{table_name}'")
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    return imported
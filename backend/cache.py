@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# 'sqlite' lets every worker and out-of-process writers (`manage.py import`)
+# invalidate each other's caches; 'local' only suits a single process that
+# is the sole writer to the database
+CACHE_BUS_BACKEND = os.getenv("CACHE_BUS_BACKEND", "sqlite")
+# Absolute by default so the server and the CLI agree on it whatever their cwd
+CACHE_BUS_DB_PATH = os.getenv("CACHE_BUS_DB_PATH", str(Path(__file__).resolve().parent / "cachebus.db"))
+# How long a worker trusts its last read of a namespace version
+CACHE_VERSION_CHECK_INTERVAL = float(os.getenv("CACHE_VERSION_CHECK_INTERVAL", "0.05"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+
+
+class LocalVersionStore:
+    """Version counters for a single process"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def bump(self, namespace: str) -> int:
+        with self._lock:
+            version = self._versions.get(namespace, 0) + 1
+            self._versions[namespace] = version
+            return version
+
+
+class SQLiteVersionStore:
+    """Version counters in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, path: str = CACHE_BUS_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_versions ("
+                "namespace TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str) -> int:
+        row = self._connection().execute(
+            "SELECT version FROM cache_versions WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, namespace: str) -> int:
+        return self._connection().execute(
+            "INSERT INTO cache_versions (namespace, version) VALUES (?, 1) "
+            "ON CONFLICT(namespace) DO UPDATE SET version = version + 1 "
+            "RETURNING version",
+            (namespace,),
+        ).fetchone()[0]
+
+
+def create_version_store(backend: str = CACHE_BUS_BACKEND):
+    if backend == "sqlite":
+        return SQLiteVersionStore()
+    if backend == "local":
+        return LocalVersionStore()
+    raise ValueError(f"Unknown cache bus backend: {backend}")
+
+
+class InvalidationBus:
+    """Cross-worker invalidation through per-namespace version counters.
+
+    Writers bump a namespace; readers notice the new version within
+    check_interval seconds and drop whatever they cached under the old one.
+    """
+
+    def __init__(self, store=None, check_interval: float = CACHE_VERSION_CHECK_INTERVAL):
+        self.store = store if store is not None else create_version_store()
+        self.check_interval = check_interval
+        self._seen: Dict[str, Tuple[int, float]] = {}
+
+    def version(self, namespace: str) -> int:
+        now = time.monotonic()
+        seen = self._seen.get(namespace)
+        if seen is not None and now - seen[1] < self.check_interval:
+            return seen[0]
+        version = self.store.get(namespace)
+        self._seen[namespace] = (version, now)
+        return version
+
+    def invalidate(self, *namespaces: str) -> None:
+        now = time.monotonic()
+        for namespace in namespaces:
+            self._seen[namespace] = (self.store.bump(namespace), now)
+
+
+invalidation_bus = InvalidationBus()
+
+
+class VersionedCache:
+    """LRU cache whose entries are only valid for the namespace version they were built at"""
+
+    def __init__(
+        self,
+        namespace: str,
+        bus: InvalidationBus = None,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        self.namespace = namespace
+        self.bus = bus or invalidation_bus
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        version = self.bus.version(self.namespace)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        value = factory()
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
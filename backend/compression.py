@@ -0,0 +1,310 @@
+import gzip
+import mimetypes
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+# Brotli quality for on-the-fly responses; precompressed sidecars always use 11
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+})
+
+# Sidecar suffix for each encoding, in server preference order
+SIDECAR_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def available_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def select_encoding(header: str, encodings: Iterable[str]) -> Optional[str]:
+    """Pick the first server-preferred encoding the client accepts"""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in encodings:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress = self._compressor.process
+            self._finish = self._compressor.finish
+        else:
+            # wbits=31 produces a gzip container rather than raw zlib
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+            self._finish = self._compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """Compress responses above a size threshold whose content type is allowlisted"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        content_types: Iterable[str] = COMPRESSIBLE_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), available_encodings()
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    def _should_compress(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.split(";")[0].strip().lower() in self.middleware.content_types
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers back until the first body chunk tells us the size
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not self._should_compress(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.encoder = _Encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming response: the final length is unknown
+            del headers["Content-Length"]
+            await self._send(self.start_message)
+
+        chunk = self.encoder.compress(body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves `.br`/`.gz` sidecars when the client accepts them"""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        encoding = None
+
+        if is_compressible(media_type):
+            accepted = parse_accept_encoding(request_headers.get("accept-encoding", ""))
+            for coding, suffix in SIDECAR_SUFFIXES.items():
+                if accepted.get(coding, accepted.get("*", 0.0)) <= 0:
+                    continue
+                sidecar_path = str(full_path) + suffix
+                try:
+                    sidecar_stat = os.stat(sidecar_path)
+                except OSError:
+                    continue
+                # Ignore sidecars left behind by an older version of the file
+                if sidecar_stat.st_mtime >= stat_result.st_mtime:
+                    full_path, stat_result, encoding = sidecar_path, sidecar_stat, coding
+                    break
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+        )
+        if is_compressible(media_type):
+            response.headers.add_vary_header("Accept-Encoding")
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class SPAStaticFiles(PrecompressedStaticFiles):
+    """Frontend build mount that falls back to index.html for client-side routes.
+
+    The app uses BrowserRouter, so a hard refresh on /admin or /collections
+    asks the server for a path that only exists in the router. Paths that
+    look like files (have an extension) and anything under the excluded
+    prefixes still 404.
+    """
+
+    def __init__(self, *args, excluded_prefixes: Iterable[str] = ("api", "uploads"), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.excluded_prefixes = frozenset(excluded_prefixes)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            if exc.status_code != 404 or not self._is_client_route(path):
+                raise
+        return await super().get_response("index.html", scope)
+
+    def _is_client_route(self, path: str) -> bool:
+        parts = Path(path).parts
+        if parts and parts[0] in self.excluded_prefixes:
+            return False
+        return not (parts and Path(parts[-1]).suffix)
+
+
+def precompress_file(path: Path, minimum_size: int = COMPRESSION_MINIMUM_SIZE) -> list:
+    """Write `.gz` (and `.br` when available) sidecars next to a static file.
+
+    Sidecars are only kept when they are actually smaller than the original.
+    Returns the list of sidecar paths written.
+    """
+    path = Path(path)
+    media_type = mimetypes.guess_type(path.name)[0] or ""
+    if not is_compressible(media_type):
+        return []
+
+    data = path.read_bytes()
+    if len(data) < minimum_size:
+        return []
+
+    candidates = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates[".br"] = brotli.compress(data, quality=11)
+
+    written = []
+    for suffix, compressed in candidates.items():
+        sidecar = path.with_name(path.name + suffix)
+        if len(compressed) >= len(data):
+            sidecar.unlink(missing_ok=True)
+            continue
+        sidecar.write_bytes(compressed)
+        written.append(sidecar)
+    return written
+
+
+def precompress_tree(directory: Path, minimum_size: int = COMPRESSION_MINIMUM_SIZE) -> list:
+    """Precompress every compressible file under a directory (e.g. a frontend build)"""
+    written = []
+    for path in sorted(Path(directory).rglob("*")):
+        if path.is_file() and path.suffix not in (".gz", ".br"):
+            written.extend(precompress_file(path, minimum_size))
+    return written
+
+
+if __name__ == "__main__":
+    for target in sys.argv[1:] or ["uploads"]:
+        sidecars = precompress_tree(Path(target))
+        print(f"{target}: wrote {len(sidecars)} precompressed files")
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -7,15 +8,51 @@ import os
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+SQL_ECHO = os.getenv("SQL_ECHO", "true").lower() == "true"
+# Dev convenience; production sets AUTO_CREATE_SCHEMA=false and runs `python manage.py migrate`
+AUTO_CREATE_SCHEMA = os.getenv("AUTO_CREATE_SCHEMA", "true").lower() == "true"
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that creates the engine the first time a session is opened"""
+
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
+
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
+_engine = None
+
+def get_engine():
+    """Build the engine on first use instead of at import time"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL, echo=SQL_ECHO)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+def create_schema(attempts: int = 5):
+    """create_all that tolerates other processes creating the same tables at once.
+
+    create_all checks for each table before creating it, so two workers
+    booting on a fresh database can both decide to create the same one; the
+    loser retries and finds it in place.
+    """
+    import models  # noqa: F401  registers the tables on Base
+
+    for attempt in range(attempts):
+        try:
+            Base.metadata.create_all(bind=get_engine())
+            return
+        except (OperationalError, ProgrammingError) as exc:
+            if "already exists" not in str(exc.orig) or attempt == attempts - 1:
+                raise
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
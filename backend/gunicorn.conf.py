@@ -0,0 +1,15 @@
+# Multi-worker launch: gunicorn -c gunicorn.conf.py server:app
+from workers import configure_worker_environment, prepare_schema, worker_count
+
+configure_worker_environment()
+
+bind = "0.0.0.0:8001"
+# Each worker also keeps its own in-memory recommendation index and refresh
+# thread; see RECOMMENDATIONS_ENABLED in recommendations.py
+workers = worker_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    # Runs once in the master before any worker is forked
+    prepare_schema()
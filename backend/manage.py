@@ -0,0 +1,117 @@
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import typer
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+cli = typer.Typer(help="PhotoStudio maintenance commands")
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    return Config(str(BACKEND_DIR / "alembic.ini"))
+
+
+@cli.command()
+def migrate(revision: str = typer.Argument("head", help="Target revision")):
+    """Apply database migrations."""
+    from alembic import command
+    from sqlalchemy import inspect
+
+    from database import get_engine
+
+    config = _alembic_config()
+    tables = set(inspect(get_engine()).get_table_names())
+    if "alembic_version" not in tables and "content" in tables:
+        # Schema was created by the old import-time create_all; adopt it as the baseline
+        typer.echo("Existing unversioned schema found, stamping baseline revision")
+        command.stamp(config, "0001")
+    command.upgrade(config, revision)
+
+
+@cli.command("bench-startup")
+def bench_startup(
+    runs: int = typer.Option(5, help="Number of cold interpreter runs"),
+    module: str = typer.Option("server", help="Module to import"),
+):
+    """Measure cold import time and lifespan startup in fresh interpreters."""
+    script = (
+        "import time\n"
+        "t0 = time.perf_counter()\n"
+        f"import {module}\n"
+        "t1 = time.perf_counter()\n"
+        f"app = getattr({module}, 'app', None)\n"
+        "if app is not None:\n"
+        "    from fastapi.testclient import TestClient\n"
+        "    with TestClient(app):\n"
+        "        pass\n"
+        "t2 = time.perf_counter()\n"
+        "print((t1 - t0) * 1000, (t2 - t1) * 1000)\n"
+    )
+    imports, startups = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        imports.append(float(output[-2]))
+        startups.append(float(output[-1]))
+
+    typer.echo(f"import {module}: median {statistics.median(imports):.1f} ms, max {max(imports):.1f} ms")
+    typer.echo(f"lifespan startup: median {statistics.median(startups):.1f} ms, max {max(startups):.1f} ms")
+
+
+@cli.command("export")
+def export_command(
+    table: str = typer.Argument(..., help="content, likes or ratings"),
+    output: Path = typer.Option(None, "--output", "-o", help="File to write, stdout if omitted"),
+    fmt: str = typer.Option("ndjson", "--format", "-f", help="ndjson, csv or parquet"),
+):
+    """Stream a table out as NDJSON, CSV or Parquet."""
+    import bulk
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with (open(output, "wb") if output else sys.stdout.buffer) as target:
+            for chunk in bulk.export_table(db, table, fmt):
+                target.write(chunk)
+    except bulk.BulkError as exc:
+        raise typer.BadParameter(str(exc))
+    finally:
+        db.close()
+
+
+@cli.command("import")
+def import_command(
+    table: str = typer.Argument(..., help="content, likes or ratings"),
+    source: Path = typer.Argument(..., exists=True, dir_okay=False, help="File to read"),
+    fmt: str = typer.Option("ndjson", "--format", "-f", help="ndjson, csv or parquet"),
+):
+    """Bulk-insert rows from an export file in chunked transactions."""
+    import bulk
+    from cache import invalidation_bus
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with open(source, "rb") as stream:
+            imported = bulk.import_table(db, table, stream, fmt)
+    except bulk.BulkError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1)
+    finally:
+        db.close()
+        invalidation_bus.invalidate(*bulk.IMPORT_INVALIDATES)
+    typer.echo(f"Imported {imported} rows into {table}")
+
+
+if __name__ == "__main__":
+    cli()
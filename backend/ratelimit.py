@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from fastapi import HTTPException, Request, status
+
+import auth
+
+# Comma-separated proxy addresses allowed to set X-Forwarded-For
+TRUSTED_PROXIES = {
+    proxy.strip() for proxy in os.getenv("TRUSTED_PROXIES", "").split(",") if proxy.strip()
+}
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # 'memory' or 'sqlite'
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "ratelimit.db")
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "10000"))
+
+VOTE_RATE_LIMIT_CAPACITY = float(os.getenv("VOTE_RATE_LIMIT_CAPACITY", "10"))
+VOTE_RATE_LIMIT_REFILL_PER_SECOND = float(os.getenv("VOTE_RATE_LIMIT_REFILL_PER_SECOND", "0.2"))
+
+
+def get_client_ip(request: Request) -> str:
+    """Client address, honouring X-Forwarded-For only from trusted proxies.
+
+    Each proxy appends the address it received the request from, so only the
+    right-hand end of the header is trustworthy: walk it from the right past
+    our own proxies and return the first address they did not vouch for.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if peer not in TRUSTED_PROXIES:
+        return peer
+    forwarded = [hop.strip() for hop in request.headers.get("X-Forwarded-For", "").split(",")]
+    for hop in reversed(forwarded):
+        if hop and hop not in TRUSTED_PROXIES:
+            return hop
+    return peer
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class MemoryBucketStore:
+    """Per-process token buckets, LRU-evicted once max_buckets is reached"""
+
+    def __init__(self, max_buckets: int = RATE_LIMIT_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        """Consume one token; return 0 if allowed, else seconds until a token is free"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+                if len(self._buckets) >= self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                tokens = _refill(bucket[0], bucket[1], now, capacity, rate)
+                self._buckets.move_to_end(key)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, path: str = RATE_LIMIT_DB_PATH, max_buckets: int = RATE_LIMIT_MAX_BUCKETS):
+        self.path = path
+        self.max_buckets = max_buckets
+        self._local = threading.local()
+        self._ops = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated "
+                "ON rate_limit_buckets (updated)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> float:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else _refill(row[0], row[1], now, capacity, rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            self._ops += 1
+            if self._ops % 1000 == 0:
+                self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return 0.0 if allowed else (1 - tokens) / rate
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Keep only the most recently used buckets
+        conn.execute(
+            "DELETE FROM rate_limit_buckets WHERE key NOT IN ("
+            "SELECT key FROM rate_limit_buckets ORDER BY updated DESC LIMIT ?)",
+            (self.max_buckets,),
+        )
+
+
+def create_bucket_store(backend: str = RATE_LIMIT_BACKEND):
+    if backend == "sqlite":
+        return SQLiteBucketStore()
+    if backend == "memory":
+        return MemoryBucketStore()
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+bucket_store = create_bucket_store()
+
+
+class RateLimit:
+    """Route dependency that answers 429 before any database work is done.
+
+    Buckets are keyed per route and per caller: the token subject when a valid
+    bearer token is sent, otherwise the client IP.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        capacity: float = VOTE_RATE_LIMIT_CAPACITY,
+        refill_per_second: float = VOTE_RATE_LIMIT_REFILL_PER_SECOND,
+        store=None,
+    ):
+        self.scope = scope
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.store = store
+
+    def client_key(self, request: Request) -> str:
+        authorization = request.headers.get("Authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            token_data = auth.verify_token(token)
+            if token_data is not None and token_data.email:
+                return f"{self.scope}:user:{token_data.email}"
+        return f"{self.scope}:ip:{get_client_ip(request)}"
+
+    def __call__(self, request: Request) -> None:
+        store = self.store or bucket_store
+        retry_after = store.take(
+            self.client_key(request), self.capacity, self.refill_per_second, time.time()
+        )
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(int(retry_after) + 1)},
+            )
@@ -0,0 +1,246 @@
+import logging
+import os
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from cache import invalidation_bus
+from models import Like, Rating, collection_items
+
+logger = logging.getLogger(__name__)
+
+# The index lives in process memory, so each worker builds and refreshes its own
+# identical copy from its own background thread: memory and refresh work scale
+# with WEB_CONCURRENCY. Raise RECOMMENDATIONS_REFRESH_SECONDS to refresh less
+# often, or set RECOMMENDATIONS_ENABLED=false to turn related content off.
+RECOMMENDATIONS_ENABLED = os.getenv("RECOMMENDATIONS_ENABLED", "true").lower() == "true"
+RECOMMENDATIONS_TOP_K = int(os.getenv("RECOMMENDATIONS_TOP_K", "20"))
+RECOMMENDATIONS_REFRESH_SECONDS = float(os.getenv("RECOMMENDATIONS_REFRESH_SECONDS", "30"))
+
+# Interaction weights; ratings below 3 stars are not a positive signal
+LIKE_WEIGHT = 1.0
+COLLECTION_WEIGHT = 1.0
+RATING_WEIGHTS = {3: 0.5, 4: 1.0, 5: 1.0}
+
+# Bumping any of these makes the next refresh rebuild the index from scratch:
+# collection edits, and bulk imports whose vote ids may sit below the watermarks
+REBUILD_NAMESPACES = ("collections", "recommendations")
+
+
+class RecommendationIndex:
+    """Item-item cosine similarity over actor x item co-engagement.
+
+    Actors are users and anonymous IPs (from likes and ratings) and
+    collections (items saved together). Each actor is down-weighted by how
+    many items it touched so a single prolific voter cannot link everything.
+    The top-K neighbours of every item are kept in a plain dict.
+    """
+
+    def __init__(self, top_k: int = RECOMMENDATIONS_TOP_K):
+        self.top_k = top_k
+        self._top: Dict[int, Tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._actors: Dict[str, int] = {}
+        self._items: Dict[int, int] = {}
+        self._item_ids = array("q")
+        self._rows = array("q")
+        self._cols = array("q")
+        self._data = array("d")
+        self._like_watermark = 0
+        self._rating_watermark = 0
+        self._rebuild_version: Optional[Tuple[int, ...]] = None
+
+    def related(self, content_id: int, limit: int = 8) -> List[int]:
+        return list(self._top.get(content_id, ())[:limit])
+
+    # ------------------------------------------------------------------
+    # Loading interactions
+    # ------------------------------------------------------------------
+
+    def _add(self, actor: str, content_id: int, weight: float) -> int:
+        actor_index = self._actors.setdefault(actor, len(self._actors))
+        item_index = self._items.get(content_id)
+        if item_index is None:
+            item_index = self._items[content_id] = len(self._item_ids)
+            self._item_ids.append(content_id)
+        self._rows.append(actor_index)
+        self._cols.append(item_index)
+        self._data.append(weight)
+        return actor_index
+
+    def _load_votes(self, db: Session) -> set:
+        """Append likes/ratings newer than the watermarks; return touched actor indices"""
+        # Fetch both before touching any state so a failed query leaves the index as it was
+        likes = db.execute(
+            select(Like.id, Like.user_id, Like.ip_address, Like.content_id)
+            .where(Like.id > self._like_watermark)
+            .order_by(Like.id)
+        ).all()
+        ratings = db.execute(
+            select(Rating.id, Rating.user_id, Rating.ip_address, Rating.content_id, Rating.score)
+            .where(Rating.id > self._rating_watermark)
+            .order_by(Rating.id)
+        ).all()
+
+        touched = set()
+        for like_id, user_id, ip_address, content_id in likes:
+            actor = f"u:{user_id}" if user_id is not None else f"ip:{ip_address}"
+            touched.add(self._add(actor, content_id, LIKE_WEIGHT))
+            self._like_watermark = like_id
+
+        for rating_id, user_id, ip_address, content_id, score in ratings:
+            self._rating_watermark = rating_id
+            weight = RATING_WEIGHTS.get(score)
+            if weight is None:
+                continue
+            actor = f"u:{user_id}" if user_id is not None else f"ip:{ip_address}"
+            touched.add(self._add(actor, content_id, weight))
+
+        return touched
+
+    def _load_collections(self, db: Session) -> None:
+        for collection_id, content_id in db.execute(
+            select(collection_items.c.collection_id, collection_items.c.content_id)
+        ):
+            self._add(f"c:{collection_id}", content_id, COLLECTION_WEIGHT)
+
+    # ------------------------------------------------------------------
+    # Similarity
+    # ------------------------------------------------------------------
+
+    def _normalized_matrix(self):
+        import numpy as np
+        from scipy import sparse
+
+        shape = (len(self._actors), len(self._item_ids))
+        matrix = sparse.csr_matrix(
+            (
+                np.frombuffer(self._data, dtype=np.float64),
+                (np.frombuffer(self._rows, dtype=np.int64), np.frombuffer(self._cols, dtype=np.int64)),
+            ),
+            shape=shape,
+        )
+        # Repeat interactions (like + rating) saturate instead of stacking up
+        matrix.data = np.minimum(matrix.data, 1.0)
+
+        # Inverse actor frequency, then L2-normalise each item column
+        actor_degree = np.diff(matrix.indptr)
+        matrix = sparse.diags(1.0 / np.log2(2.0 + actor_degree)) @ matrix
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+        inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        return (matrix @ sparse.diags(inverse)).tocsc()
+
+    def _top_k_rows(self, similarity, item_indices) -> Dict[int, Tuple[int, ...]]:
+        import numpy as np
+
+        top = {}
+        item_ids = np.frombuffer(self._item_ids, dtype=np.int64)
+        for position, item_index in enumerate(item_indices):
+            start, end = similarity.indptr[position], similarity.indptr[position + 1]
+            neighbours = similarity.indices[start:end]
+            scores = similarity.data[start:end]
+            keep = (neighbours != item_index) & (scores > 0)
+            neighbour_ids, scores = item_ids[neighbours[keep]], scores[keep]
+            if len(scores) > self.top_k:
+                # Keep everything tied with the k-th best so the cut below is exact
+                threshold = np.partition(scores, -self.top_k)[-self.top_k]
+                candidates = scores >= threshold
+                neighbour_ids, scores = neighbour_ids[candidates], scores[candidates]
+            # Highest score first, ties broken by content id so rebuilds are deterministic
+            order = np.lexsort((neighbour_ids, -scores))[:self.top_k]
+            top[int(item_ids[item_index])] = tuple(int(i) for i in neighbour_ids[order])
+        return top
+
+    def _recompute(self, touched_actors: Optional[set]) -> int:
+        import numpy as np
+
+        if not self._item_ids:
+            return 0
+
+        normalized = self._normalized_matrix()
+        transposed = normalized.T.tocsr()
+
+        if touched_actors is None:
+            rows = np.arange(len(self._item_ids))
+        else:
+            # Items whose column changed, plus every item that shares an actor with them
+            actor_rows = normalized.tocsr()[sorted(touched_actors)]
+            changed_items = np.unique(actor_rows.indices)
+            reach = transposed @ normalized[:, changed_items]
+            rows = np.unique(np.concatenate([changed_items, reach.tocsr().nonzero()[0]]))
+
+        similarity = (transposed[rows] @ normalized).tocsr()
+        similarity.sort_indices()
+        top = self._top_k_rows(similarity, rows)
+
+        merged = dict(self._top) if touched_actors is not None else {}
+        merged.update(top)
+        # Swap in a complete table so readers never see a half-built one
+        self._top = {item: neighbours for item, neighbours in merged.items() if neighbours}
+        return len(rows)
+
+    def refresh(self, db: Session) -> int:
+        """Fold new interactions into the index; return the number of items recomputed.
+
+        Votes created through the API are append-only and picked up
+        incrementally by id watermark. Collection changes and bulk imports
+        bump one of REBUILD_NAMESPACES on the invalidation bus and trigger a
+        full rebuild, as does any failed refresh.
+        """
+        with self._lock:
+            try:
+                return self._refresh(db)
+            except Exception:
+                # Loaded rows may be ahead of the similarity table; rebuild from scratch next time
+                self._rebuild_version = None
+                raise
+
+    def _refresh(self, db: Session) -> int:
+        rebuild_version = tuple(invalidation_bus.version(namespace) for namespace in REBUILD_NAMESPACES)
+        if rebuild_version != self._rebuild_version:
+            self._reset()
+            self._load_collections(db)
+            self._load_votes(db)
+            count = self._recompute(None)
+            self._rebuild_version = rebuild_version
+            return count
+
+        touched = self._load_votes(db)
+        if not touched:
+            return 0
+        return self._recompute(touched)
+
+
+recommendation_index = RecommendationIndex()
+
+
+def start_background_refresh(
+    session_factory,
+    index: RecommendationIndex = recommendation_index,
+    interval: float = RECOMMENDATIONS_REFRESH_SECONDS,
+) -> threading.Event:
+    """Keep the index fresh from a daemon thread; set the returned event to stop it"""
+    stop = threading.Event()
+
+    def run():
+        while True:
+            db = session_factory()
+            try:
+                updated = index.refresh(db)
+                if updated:
+                    logger.info("Recommendation index updated for %d items", updated)
+            except Exception:
+                logger.exception("Recommendation index refresh failed")
+            finally:
+                db.close()
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=run, name="recommendations", daemon=True).start()
+    return stop
@@ -143,4 +143,38 @@ class ContentStats(BaseModel):
 
 class UserStats(BaseModel):
     total_users: int
-    total_collections: int
\ No newline at end of file
+    total_collections: int
+
+class ImportResult(BaseModel):
+    table: str
+    imported: int
+
+# Analytics Schemas
+class DailyEngagement(BaseModel):
+    dates: List[str]
+    likes: List[int]
+    ratings: List[int]
+    average_rating: List[Optional[float]]
+
+class CategoryEngagement(BaseModel):
+    category: str
+    items: int
+    likes: int
+    ratings: int
+    average_rating: float
+
+class AgeBucketEngagement(BaseModel):
+    age_days: str
+    items: int
+    average_engagement: float
+    engagement_per_day: float
+
+class EngagementAnalytics(BaseModel):
+    days: int
+    category: Optional[str] = None
+    content_id: Optional[int] = None
+    generated_at: datetime
+    daily: DailyEngagement
+    rating_distribution: List[int]  # counts for scores 1-5
+    categories: List[CategoryEngagement]
+    engagement_by_age: List[AgeBucketEngagement]
\ No newline at end of file
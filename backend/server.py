@@ -1,9 +1,10 @@
 from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import timedelta
+from contextlib import asynccontextmanager
 from typing import List, Optional
 import os
 import shutil
@@ -12,26 +13,43 @@ from pathlib import Path
 import logging
 
 # Local imports
-from database import engine, get_db
-from models import Base, User, Content, Like, Rating, Collection, UserRole
+from database import AUTO_CREATE_SCHEMA, SessionLocal, create_schema, get_db
+from models import User, Content, Like, Rating, Collection, UserRole
 import schemas
 import auth
+from compression import CompressionMiddleware, PrecompressedStaticFiles, SPAStaticFiles
+from ratelimit import RateLimit, get_client_ip
+from cache import VersionedCache, invalidation_bus
+import bulk
+import recommendations
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Create directories for file uploads
 UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-(UPLOAD_DIR / "photos").mkdir(exist_ok=True)
-(UPLOAD_DIR / "videos").mkdir(exist_ok=True)
-(UPLOAD_DIR / "thumbnails").mkdir(exist_ok=True)
+
+def bootstrap():
+    """One-off startup work, run from the lifespan handler instead of at import"""
+    if AUTO_CREATE_SCHEMA:
+        create_schema()
+    
+    # Create directories for file uploads
+    for subdir in ("photos", "videos", "thumbnails"):
+        (UPLOAD_DIR / subdir).mkdir(parents=True, exist_ok=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    bootstrap()
+    stop_recommendations = None
+    if recommendations.RECOMMENDATIONS_ENABLED:
+        # Built off the request path; related-content lookups read the finished table
+        stop_recommendations = recommendations.start_background_refresh(SessionLocal)
+    yield
+    if stop_recommendations is not None:
+        stop_recommendations.set()
 
 # Create the main app
-app = FastAPI(title="PhotoStudio API", version="1.0.0")
+app = FastAPI(title="PhotoStudio API", version="1.0.0", lifespan=lifespan)
 
-# Mount static files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Mount static files (serves precompressed .br/.gz sidecars when present)
+app.mount("/uploads", PrecompressedStaticFiles(directory=UPLOAD_DIR, check_dir=False), name="uploads")
 
 # Create API router
 api_router = APIRouter(prefix="/api")
@@ -45,16 +63,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression for JSON listings and text assets
+app.add_middleware(CompressionMiddleware)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Helper function to get client IP
-def get_client_ip(request: Request) -> str:
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host
+# Per-caller token buckets for the anonymous vote endpoints
+like_rate_limit = RateLimit("like")
+rate_rate_limit = RateLimit("rate")
+
+# Read caches, dropped across workers whenever a write bumps their namespace
+content_cache = VersionedCache("content")
+category_cache = VersionedCache("categories")
 
 # ============================================================================
 # AUTHENTICATION ROUTES
@@ -144,26 +166,22 @@ async def get_content(
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Content).filter(Content.is_published == True)
-    
-    if category and category != "all":
-        query = query.filter(Content.category == category)
-    
-    if search:
-        query = query.filter(
-            Content.title.contains(search) | 
-            Content.description.contains(search)
-        )
-    
-    content = query.offset(skip).limit(limit).all()
-    
-    # Add computed properties
-    for item in content:
-        item.likes_count = len(item.likes)
-        item.average_rating = item.average_rating
-        item.ratings_count = len(item.ratings)
-    
-    return content
+    def load_content():
+        query = db.query(Content).filter(Content.is_published == True)
+        
+        if category and category != "all":
+            query = query.filter(Content.category == category)
+        
+        if search:
+            query = query.filter(
+                Content.title.contains(search) | 
+                Content.description.contains(search)
+            )
+        
+        content = query.offset(skip).limit(limit).all()
+        return [schemas.Content.model_validate(item).model_dump() for item in content]
+    
+    return content_cache.get_or_set((category, search, skip, limit), load_content)
 
 @api_router.get("/content/{content_id}", response_model=schemas.Content)
 async def get_content_item(content_id: int, db: Session = Depends(get_db)):
@@ -177,38 +195,54 @@ async def get_content_item(content_id: int, db: Session = Depends(get_db)):
     
     return content
 
+@api_router.get("/content/{content_id}/related", response_model=List[schemas.Content])
+async def get_related_content(content_id: int, limit: int = 8, db: Session = Depends(get_db)):
+    related_ids = recommendations.recommendation_index.related(content_id, min(max(limit, 1), 50))
+    if not related_ids:
+        return []
+    
+    items = db.query(Content).filter(
+        Content.id.in_(related_ids),
+        Content.is_published == True
+    ).all()
+    by_id = {item.id: item for item in items}
+    return [by_id[item_id] for item_id in related_ids if item_id in by_id]
+
 @api_router.get("/categories")
 async def get_categories(db: Session = Depends(get_db)):
-    categories = db.query(
-        Content.category,
-        func.count(Content.id).label('count')
-    ).filter(Content.is_published == True).group_by(Content.category).all()
-    
-    result = [{"id": "all", "name": "Todas", "count": sum(cat.count for cat in categories)}]
-    category_names = {
-        "portrait": "Retratos",
-        "wedding": "Casamentos", 
-        "event": "Eventos",
-        "family": "Família",
-        "nature": "Natureza",
-        "architecture": "Arquitetura",
-        "urban": "Urbano"
-    }
-    
-    for cat in categories:
-        result.append({
-            "id": cat.category,
-            "name": category_names.get(cat.category, cat.category.title()),
-            "count": cat.count
-        })
-    
-    return result
+    def load_categories():
+        categories = db.query(
+            Content.category,
+            func.count(Content.id).label('count')
+        ).filter(Content.is_published == True).group_by(Content.category).all()
+        
+        result = [{"id": "all", "name": "Todas", "count": sum(cat.count for cat in categories)}]
+        category_names = {
+            "portrait": "Retratos",
+            "wedding": "Casamentos", 
+            "event": "Eventos",
+            "family": "Família",
+            "nature": "Natureza",
+            "architecture": "Arquitetura",
+            "urban": "Urbano"
+        }
+        
+        for cat in categories:
+            result.append({
+                "id": cat.category,
+                "name": category_names.get(cat.category, cat.category.title()),
+                "count": cat.count
+            })
+        
+        return result
+    
+    return category_cache.get_or_set("all", load_categories)
 
 # ============================================================================
 # INTERACTION ROUTES (LIKES & RATINGS)
 # ============================================================================
 
-@api_router.post("/content/{content_id}/like")
+@api_router.post("/content/{content_id}/like", dependencies=[Depends(like_rate_limit)])
 async def like_content(
     content_id: int,
     request: Request,
@@ -243,10 +277,11 @@ async def like_content(
     
     db.add(like)
     db.commit()
+    invalidation_bus.invalidate("content")
     
     return {"message": "Content liked successfully"}
 
-@api_router.post("/content/{content_id}/rate")
+@api_router.post("/content/{content_id}/rate", dependencies=[Depends(rate_rate_limit)])
 async def rate_content(
     content_id: int,
     rating_data: schemas.RatingCreate,
@@ -287,6 +322,7 @@ async def rate_content(
     
     db.add(rating)
     db.commit()
+    invalidation_bus.invalidate("content")
     
     return {"message": "Content rated successfully"}
 
@@ -347,6 +383,7 @@ async def add_item_to_collection(
     
     collection.items.append(content)
     db.commit()
+    invalidation_bus.invalidate("collections")
     
     return {"message": "Item added to collection"}
 
@@ -386,6 +423,66 @@ async def get_admin_content(
     content = db.query(Content).offset(skip).limit(limit).all()
     return content
 
+# Plain def: the pandas aggregation is CPU-bound and runs in the threadpool, off the event loop
+@api_router.get("/admin/analytics", response_model=schemas.EngagementAnalytics)
+def get_admin_analytics(
+    days: int = 365,
+    category: Optional[str] = None,
+    content_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    _: auth.get_admin_from_credentials = Depends(auth.get_admin_from_credentials)
+):
+    # pandas/numpy are only loaded once someone asks for analytics
+    import analytics
+    
+    if days < 1 or days > 3650:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 3650")
+    
+    return analytics.get_engagement(db, days, category if category != "all" else None, content_id)
+
+@api_router.get("/admin/export/{table}")
+async def export_table(
+    table: str,
+    format: str = "ndjson",
+    _: auth.get_admin_from_credentials = Depends(auth.get_admin_from_credentials)
+):
+    try:
+        bulk.get_table(table)
+        media_type = bulk.EXPORT_FORMATS[format]
+    except (bulk.BulkError, KeyError):
+        raise HTTPException(status_code=400, detail=f"Unsupported export: {table} as {format}")
+    
+    def stream():
+        # The request-scoped session is closed before the body is sent, so use our own
+        db = SessionLocal()
+        try:
+            yield from bulk.export_table(db, table, format)
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'}
+    )
+
+@api_router.post("/admin/import/{table}", response_model=schemas.ImportResult)
+def import_table(
+    table: str,
+    file: UploadFile = File(...),
+    format: str = Form("ndjson"),
+    db: Session = Depends(get_db),
+    _: auth.get_admin_from_credentials = Depends(auth.get_admin_from_credentials)
+):
+    try:
+        imported = bulk.import_table(db, table, file.file, format)
+    except bulk.BulkError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        invalidation_bus.invalidate(*bulk.IMPORT_INVALIDATES)
+    
+    return {"table": table, "imported": imported}
+
 # Root route
 @api_router.get("/")
 async def root():
@@ -394,6 +491,22 @@ async def root():
 # Include the router in the main app
 app.include_router(api_router)
 
+# Serve the frontend build (run `python compression.py <build dir>` after building)
+FRONTEND_BUILD_DIR = Path(
+    os.getenv("FRONTEND_BUILD_DIR", Path(__file__).resolve().parent.parent / "frontend" / "build")
+)
+if FRONTEND_BUILD_DIR.is_dir():
+    app.mount("/", SPAStaticFiles(directory=FRONTEND_BUILD_DIR, html=True), name="frontend")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    from workers import configure_worker_environment, prepare_schema, worker_count
+    
+    workers = worker_count()
+    if workers > 1:
+        # Worker processes re-import this module and need an app import string
+        configure_worker_environment()
+        prepare_schema()
+        uvicorn.run("server:app", host="0.0.0.0", port=8001, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
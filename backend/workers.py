@@ -0,0 +1,30 @@
+import multiprocessing
+import os
+
+
+def worker_count() -> int:
+    """Number of server processes: WEB_CONCURRENCY if set, otherwise one per core"""
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    return multiprocessing.cpu_count()
+
+
+def configure_worker_environment() -> None:
+    """Switch per-process state to the shared SQLite backends.
+
+    Must run in the parent before workers are spawned so every worker
+    sees the same cache versions and rate limit buckets.
+    """
+    os.environ.setdefault("CACHE_BUS_BACKEND", "sqlite")
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "sqlite")
+
+
+def prepare_schema() -> None:
+    """Create the schema once in the parent so workers don't race on create_all"""
+    import database
+
+    if database.AUTO_CREATE_SCHEMA:
+        database.create_schema()
+        # Workers inherit the environment and skip their own create_all
+        os.environ["AUTO_CREATE_SCHEMA"] = "false"
@@ -1,6 +1,7 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { Upload, Image, Video, X, Plus, Save, Eye, Trash2, Edit3, BarChart3, Users, Camera } from 'lucide-react';
 import AdminLogin from './AdminLogin';
+import EngagementAnalytics from './EngagementAnalytics';
 import { adminAPI } from '../utils/api';
 
 const AdminPanel = () => {
@@ -274,6 +275,9 @@ const AdminPanel = () => {
           </div>
         )}
 
+        {/* Engagement Analytics */}
+        <EngagementAnalytics categories={categories} />
+
         <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
           {/* Upload Section */}
           <div className="lg:col-span-1">
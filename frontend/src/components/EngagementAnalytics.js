@@ -0,0 +1,169 @@
+import React, { useState, useEffect } from 'react';
+import { TrendingUp, Star } from 'lucide-react';
+import { adminAPI } from '../utils/api';
+
+const periods = [
+  { value: 30, label: '30 dias' },
+  { value: 90, label: '90 dias' },
+  { value: 365, label: '1 ano' }
+];
+
+const EngagementAnalytics = ({ categories }) => {
+  const [analytics, setAnalytics] = useState(null);
+  const [days, setDays] = useState(90);
+  const [category, setCategory] = useState('all');
+  const [isLoading, setIsLoading] = useState(false);
+
+  useEffect(() => {
+    const loadAnalytics = async () => {
+      setIsLoading(true);
+      try {
+        const response = await adminAPI.getAnalytics({ days, category });
+        setAnalytics(response.data);
+      } catch (error) {
+        console.error('Error loading analytics:', error);
+      } finally {
+        setIsLoading(false);
+      }
+    };
+
+    loadAnalytics();
+  }, [days, category]);
+
+  if (!analytics) {
+    return null;
+  }
+
+  const { daily, rating_distribution: distribution } = analytics;
+  const dailyTotals = daily.likes.map((likes, index) => likes + daily.ratings[index]);
+  const maxDaily = Math.max(1, ...dailyTotals);
+  const maxScoreCount = Math.max(1, ...distribution);
+  const categoryLabel = (value) =>
+    categories.find(cat => cat.value === value)?.label || value;
+
+  return (
+    <div className={`bg-white rounded-xl shadow-sm border border-gray-200 p-6 mb-12 ${isLoading ? 'opacity-60' : ''}`}>
+      <div className="flex flex-col md:flex-row md:items-center md:justify-between mb-6 gap-4">
+        <h2 className="text-xl font-medium text-gray-900 flex items-center">
+          <TrendingUp className="h-5 w-5 mr-2" />
+          Engajamento
+        </h2>
+        <div className="flex gap-2">
+          <select
+            value={category}
+            onChange={(e) => setCategory(e.target.value)}
+            className="border border-gray-300 rounded-lg px-3 py-2 text-sm focus:outline-none focus:ring-2 focus:ring-black"
+          >
+            <option value="all">Todas as categorias</option>
+            {categories.map(cat => (
+              <option key={cat.value} value={cat.value}>{cat.label}</option>
+            ))}
+          </select>
+          <select
+            value={days}
+            onChange={(e) => setDays(Number(e.target.value))}
+            className="border border-gray-300 rounded-lg px-3 py-2 text-sm focus:outline-none focus:ring-2 focus:ring-black"
+          >
+            {periods.map(period => (
+              <option key={period.value} value={period.value}>{period.label}</option>
+            ))}
+          </select>
+        </div>
+      </div>
+
+      {/* Daily likes + ratings */}
+      <div className="mb-8">
+        <p className="text-sm font-medium text-gray-600 mb-2">Curtidas e avaliações por dia</p>
+        <div className="flex items-end h-32 gap-px bg-gray-50 rounded">
+          {dailyTotals.map((total, index) => (
+            <div
+              key={daily.dates[index]}
+              title={`${daily.dates[index]}: ${daily.likes[index]} curtidas, ${daily.ratings[index]} avaliações`}
+              className="flex-1 bg-blue-500 rounded-t-sm"
+              style={{ height: `${(total / maxDaily) * 100}%` }}
+            />
+          ))}
+        </div>
+        <div className="flex justify-between text-xs text-gray-500 mt-1">
+          <span>{daily.dates[0]}</span>
+          <span>{daily.dates[daily.dates.length - 1]}</span>
+        </div>
+      </div>
+
+      <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
+        {/* Rating distribution */}
+        <div>
+          <p className="text-sm font-medium text-gray-600 mb-2">Distribuição de avaliações</p>
+          <div className="space-y-2">
+            {[5, 4, 3, 2, 1].map(score => (
+              <div key={score} className="flex items-center text-sm">
+                <span className="w-8 flex items-center text-gray-700">
+                  {score}<Star className="h-3 w-3 ml-0.5 text-yellow-500" />
+                </span>
+                <div className="flex-1 bg-gray-100 rounded h-3 mx-2">
+                  <div
+                    className="bg-yellow-500 h-3 rounded"
+                    style={{ width: `${(distribution[score - 1] / maxScoreCount) * 100}%` }}
+                  />
+                </div>
+                <span className="w-12 text-right text-gray-600">{distribution[score - 1]}</span>
+              </div>
+            ))}
+          </div>
+        </div>
+
+        {/* Per category */}
+        <div>
+          <p className="text-sm font-medium text-gray-600 mb-2">Por categoria</p>
+          <table className="w-full text-sm">
+            <thead>
+              <tr className="text-left text-gray-500">
+                <th className="font-normal">Categoria</th>
+                <th className="font-normal text-right">Curtidas</th>
+                <th className="font-normal text-right">Avaliações</th>
+                <th className="font-normal text-right">Média</th>
+              </tr>
+            </thead>
+            <tbody>
+              {analytics.categories.map(row => (
+                <tr key={row.category} className="text-gray-800">
+                  <td>{categoryLabel(row.category)}</td>
+                  <td className="text-right">{row.likes}</td>
+                  <td className="text-right">{row.ratings}</td>
+                  <td className="text-right">{row.average_rating.toFixed(1)}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+
+        {/* Engagement vs. upload age */}
+        <div>
+          <p className="text-sm font-medium text-gray-600 mb-2">Engajamento por idade do upload</p>
+          <table className="w-full text-sm">
+            <thead>
+              <tr className="text-left text-gray-500">
+                <th className="font-normal">Dias</th>
+                <th className="font-normal text-right">Itens</th>
+                <th className="font-normal text-right">Média</th>
+                <th className="font-normal text-right">Por dia</th>
+              </tr>
+            </thead>
+            <tbody>
+              {analytics.engagement_by_age.map(row => (
+                <tr key={row.age_days} className="text-gray-800">
+                  <td>{row.age_days}</td>
+                  <td className="text-right">{row.items}</td>
+                  <td className="text-right">{row.average_engagement.toFixed(1)}</td>
+                  <td className="text-right">{row.engagement_per_day.toFixed(2)}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      </div>
+    </div>
+  );
+};
+
+export default EngagementAnalytics;
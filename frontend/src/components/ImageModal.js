@@ -1,9 +1,27 @@
-import React, { useEffect } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useAuth } from '../contexts/AuthContext';
+import { contentAPI } from '../utils/api';
 import { X, Heart, Star, Bookmark, Download, Share2, Play } from 'lucide-react';
 
 const ImageModal = ({ item, isOpen, onClose, onLike, onRate, isLiked, userRating }) => {
   const { user, saveItem, unsaveItem } = useAuth();
+  const [relatedItems, setRelatedItems] = useState([]);
+
+  useEffect(() => {
+    setRelatedItems([]);
+    if (!isOpen) return;
+
+    let cancelled = false;
+    contentAPI.getRelatedContent(item.id, { limit: 6 })
+      .then(response => {
+        if (!cancelled) setRelatedItems(response.data);
+      })
+      .catch(error => console.error('Error loading related content:', error));
+
+    return () => {
+      cancelled = true;
+    };
+  }, [isOpen, item.id]);
 
   useEffect(() => {
     if (isOpen) {
@@ -203,6 +221,27 @@ const ImageModal = ({ item, isOpen, onClose, onLike, onRate, isLiked, userRating
               </div>
             </div>
 
+            {/* Related Content */}
+            {relatedItems.length > 0 && (
+              <div className="border-t pt-6 mt-6">
+                <h3 className="text-lg font-medium text-gray-900 mb-4">
+                  Relacionados
+                </h3>
+                <div className="grid grid-cols-3 gap-2">
+                  {relatedItems.map(related => (
+                    <div key={related.id} className="group">
+                      <img
+                        src={related.thumbnail_path || related.file_path}
+                        alt={related.title}
+                        className="w-full aspect-square object-cover rounded-md group-hover:opacity-80 transition-opacity"
+                      />
+                      <p className="text-xs text-gray-600 mt-1 truncate">{related.title}</p>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
+
             {/* Technical Info */}
             {item.type === 'video' && (
               <div className="border-t pt-6 mt-6">
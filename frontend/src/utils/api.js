@@ -53,6 +53,7 @@ export const authAPI = {
 export const contentAPI = {
   getContent: (params = {}) => api.get('/content', { params }),
   getContentById: (id) => api.get(`/content/${id}`),
+  getRelatedContent: (id, params = {}) => api.get(`/content/${id}/related`, { params }),
   getCategories: () => api.get('/categories'),
   likeContent: (contentId) => api.post(`/content/${contentId}/like`),
   rateContent: (contentId, score) => api.post(`/content/${contentId}/rate`, { content_id: contentId, score }),
@@ -68,6 +69,7 @@ export const collectionsAPI = {
 // Admin API
 export const adminAPI = {
   getStats: () => api.get('/admin/stats'),
+  getAnalytics: (params = {}) => api.get('/admin/analytics', { params }),
   getContent: (params = {}) => api.get('/admin/content', { params }),
   uploadContent: (formData) => api.post('/admin/content', formData, {
     headers: {
@@ -0,0 +1,28 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Backend modules import each other as top-level modules (`import auth`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+# Keep the shared cache bus of a dev server out of the test run
+os.environ.setdefault("CACHE_BUS_DB_PATH", str(Path(tempfile.mkdtemp()) / "cachebus.db"))
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on a throwaway SQLite database with the full schema"""
+    from models import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
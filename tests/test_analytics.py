@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics import compute_engagement
+from models import Content, Like, Rating
+
+NOW = datetime(2024, 6, 30, 12, 0)
+
+
+def add_content(db, category="paisagem", age_days=0):
+    item = Content(
+        title="Item",
+        file_path="uploads/photos/x.jpg",
+        file_type="photo",
+        category=category,
+        upload_date=NOW - timedelta(days=age_days),
+    )
+    db.add(item)
+    db.commit()
+    return item
+
+
+def add_likes(db, item, *days_ago):
+    for n, age in enumerate(days_ago):
+        db.add(Like(content_id=item.id, ip_address=f"10.0.0.{n}", created_at=NOW - timedelta(days=age)))
+    db.commit()
+
+
+def add_ratings(db, item, *scores, days_ago=0):
+    for n, score in enumerate(scores):
+        db.add(Rating(
+            content_id=item.id, score=score, ip_address=f"10.1.0.{n}",
+            created_at=NOW - timedelta(days=days_ago),
+        ))
+    db.commit()
+
+
+def age_bucket(result, label):
+    return next(row for row in result["engagement_by_age"] if row["age_days"] == label)
+
+
+def test_engagement_rate_only_counts_days_inside_the_window(db):
+    old = add_content(db, age_days=364)
+    add_likes(db, old, *range(10))
+
+    result = compute_engagement(db, days=30, now=NOW)
+
+    # 10 votes over the 30 days the window could see, not over the item's 365-day age
+    assert age_bucket(result, "181-365")["engagement_per_day"] == pytest.approx(10 / 31, abs=1e-4)
+
+
+def test_daily_series_is_zero_filled(db):
+    item = add_content(db, age_days=20)
+    add_likes(db, item, 0, 0, 3)
+    add_ratings(db, item, 4, 2, days_ago=3)
+
+    daily = compute_engagement(db, days=7, now=NOW)["daily"]
+
+    assert daily["dates"] == [f"2024-06-{day}" for day in range(23, 31)]
+    assert daily["likes"] == [0, 0, 0, 0, 1, 0, 0, 2]
+    assert daily["ratings"] == [0, 0, 0, 0, 2, 0, 0, 0]
+    assert daily["average_rating"] == [None, None, None, None, 3.0, None, None, None]
+
+
+def test_votes_outside_the_window_are_ignored(db):
+    item = add_content(db, age_days=100)
+    add_likes(db, item, 1, 40)
+
+    result = compute_engagement(db, days=30, now=NOW)
+
+    assert sum(result["daily"]["likes"]) == 1
+    assert result["categories"][0]["likes"] == 1
+
+
+def test_rating_distribution_and_category_averages(db):
+    landscape = add_content(db, "paisagem")
+    portrait = add_content(db, "retrato")
+    add_ratings(db, landscape, 5, 5, 4)
+    add_ratings(db, portrait, 1, 2)
+    add_likes(db, portrait, 0)
+    add_content(db, "retrato")
+
+    result = compute_engagement(db, days=30, now=NOW)
+
+    assert result["rating_distribution"] == [1, 1, 0, 1, 2]
+    assert result["categories"] == [
+        {"category": "paisagem", "items": 1, "likes": 0, "ratings": 3, "average_rating": 4.67},
+        {"category": "retrato", "items": 2, "likes": 1, "ratings": 2, "average_rating": 1.5},
+    ]
+
+
+def test_engagement_by_upload_age(db):
+    add_likes(db, add_content(db, age_days=2), 0, 1)
+    add_likes(db, add_content(db, age_days=5), 0, 0, 0, 0)
+    add_likes(db, add_content(db, age_days=45), 0)
+    add_content(db, age_days=400)
+
+    result = compute_engagement(db, days=365, now=NOW)
+
+    assert [row["age_days"] for row in result["engagement_by_age"]] == [
+        "0-7", "8-30", "31-90", "91-180", "181-365", "365+",
+    ]
+    assert age_bucket(result, "0-7") == {
+        "age_days": "0-7", "items": 2, "average_engagement": 3.0,
+        "engagement_per_day": pytest.approx((2 / 3 + 4 / 6) / 2, abs=1e-4),
+    }
+    assert age_bucket(result, "31-90")["items"] == 1
+    assert age_bucket(result, "8-30")["items"] == 0
+    assert age_bucket(result, "365+")["average_engagement"] == 0.0
+
+
+def test_category_and_content_scoping(db):
+    landscape = add_content(db, "paisagem")
+    portrait = add_content(db, "retrato")
+    add_likes(db, landscape, 0, 0)
+    add_likes(db, portrait, 0)
+    add_ratings(db, portrait, 3)
+
+    by_category = compute_engagement(db, days=30, category="retrato", now=NOW)
+    assert [row["category"] for row in by_category["categories"]] == ["retrato"]
+    assert sum(by_category["daily"]["likes"]) == 1
+    assert by_category["rating_distribution"] == [0, 0, 1, 0, 0]
+
+    by_item = compute_engagement(db, days=30, content_id=landscape.id, now=NOW)
+    assert sum(by_item["daily"]["likes"]) == 2
+    assert sum(by_item["daily"]["ratings"]) == 0
+    assert by_item["categories"][0]["items"] == 1
+
+
+def test_empty_database(db):
+    result = compute_engagement(db, days=7, now=NOW)
+
+    assert len(result["daily"]["dates"]) == 8
+    assert set(result["daily"]["likes"]) == {0}
+    assert result["rating_distribution"] == [0, 0, 0, 0, 0]
+    assert result["categories"] == []
+    assert all(row["items"] == 0 for row in result["engagement_by_age"])
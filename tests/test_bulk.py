@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from bulk import BulkError, export_table, import_table
+from cache import invalidation_bus
+from models import Content, Like, Rating
+
+
+def ndjson(*rows):
+    return io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode())
+
+
+@pytest.fixture
+def content(db):
+    item = Content(title="Praia", file_path="uploads/photos/a.jpg", file_type="photo", category="paisagem")
+    db.add(item)
+    db.commit()
+    return item
+
+
+def test_import_ratings(db, content):
+    rows = [{"content_id": content.id, "score": score, "ip_address": "203.0.113.9"} for score in (1, 5)]
+    assert import_table(db, "ratings", ndjson(*rows), chunk_size=1) == 2
+    assert sorted(r.score for r in db.query(Rating)) == [1, 5]
+
+
+@pytest.mark.parametrize("score", [0, 6, -1])
+def test_import_rejects_out_of_range_scores(db, content, score):
+    stream = ndjson({"content_id": content.id, "score": 4}, {"content_id": content.id, "score": score})
+    with pytest.raises(BulkError, match="Row 2: score must be between 1 and 5"):
+        import_table(db, "ratings", stream)
+    assert db.query(Rating).count() == 0
+
+
+@pytest.mark.parametrize("table, extra", [("likes", {}), ("ratings", {"score": 3})])
+def test_import_rejects_missing_content(db, content, table, extra):
+    stream = ndjson({"content_id": content.id, **extra}, {"content_id": 999, **extra})
+    with pytest.raises(BulkError, match="Row 2: content 999 does not exist"):
+        import_table(db, table, stream)
+
+
+def test_missing_content_rejects_only_the_current_chunk(db, content):
+    stream = ndjson({"content_id": content.id}, {"content_id": content.id}, {"content_id": 999})
+    with pytest.raises(BulkError, match="Row 3:"):
+        import_table(db, "likes", stream, chunk_size=2)
+    # The first chunk was already committed
+    assert db.query(Like).count() == 2
+
+
+def test_export_round_trips_through_import(db, content):
+    import_table(db, "likes", ndjson({"content_id": content.id, "ip_address": "203.0.113.9"}))
+    exported = b"".join(export_table(db, "likes", "ndjson"))
+    db.query(Like).delete()
+    db.commit()
+
+    assert import_table(db, "likes", io.BytesIO(exported)) == 1
+    assert db.query(Like).one().ip_address == "203.0.113.9"
+
+
+# ============================================================================
+# MALFORMED INPUT
+# ============================================================================
+
+def test_import_rejects_non_parquet_file(db):
+    with pytest.raises(BulkError, match="Invalid Parquet file"):
+        import_table(db, "likes", io.BytesIO(b"not a parquet file"), "parquet")
+
+
+def test_import_rejects_csv_that_is_not_utf8(db):
+    stream = io.BytesIO("content_id,ip_address\n1,caf\xe9\n".encode("latin-1"))
+    with pytest.raises(BulkError, match="not valid UTF-8"):
+        import_table(db, "likes", stream, "csv")
+
+
+def test_import_rejects_ndjson_that_is_not_utf8(db):
+    with pytest.raises(BulkError, match="Line 1 is not valid UTF-8"):
+        import_table(db, "likes", io.BytesIO(b'{"ip_address": "caf\xe9"}\n'))
+
+
+@pytest.mark.parametrize("table, row, column", [
+    ("likes", {"content_id": 1, "created_at": 5}, "created_at"),
+    ("content", {"title": {"a": 1}, "file_path": "a.jpg", "file_type": "photo", "category": "x"}, "title"),
+    ("content", {"title": "a", "file_path": "a.jpg", "file_type": "photo", "category": "x", "width": [1]}, "width"),
+    ("content", {"title": "a", "file_path": "a.jpg", "file_type": "photo", "category": "x", "is_published": {}}, "is_published"),
+    ("ratings", {"content_id": 1, "score": 4.5}, "score"),
+])
+def test_import_rejects_wrongly_typed_values(db, content, table, row, column):
+    with pytest.raises(BulkError, match=f"Row 1: invalid value for '{column}'"):
+        import_table(db, table, ndjson(row))
+
+
+def test_import_endpoint_answers_400_for_malformed_files(db):
+    from fastapi.testclient import TestClient
+
+    import auth
+    import server
+    from database import get_db
+
+    server.app.dependency_overrides[get_db] = lambda: db
+    server.app.dependency_overrides[auth.get_admin_from_credentials] = lambda: "admin"
+    try:
+        client = TestClient(server.app)
+        for fmt, payload in [
+            ("parquet", b"not a parquet file"),
+            ("csv", b"content_id,ip_address\n1,caf\xe9\n"),
+            ("ndjson", b'{"content_id": 1, "created_at": 5}\n'),
+        ]:
+            response = client.post(
+                "/api/admin/import/likes", data={"format": fmt}, files={"file": ("upload", payload)}
+            )
+            assert response.status_code == 400, (fmt, response.text)
+    finally:
+        server.app.dependency_overrides.clear()
+
+
+def test_cli_import_invalidates_server_caches(db, content, tmp_path):
+    before = invalidation_bus.store.get("content")
+    source = tmp_path / "likes.ndjson"
+    source.write_text(json.dumps({"content_id": content.id}) + "\n")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'test.db'}", SQL_ECHO="false")
+    subprocess.run(
+        [sys.executable, "manage.py", "import", "likes", str(source)],
+        cwd=Path(__file__).resolve().parent.parent / "backend", env=env, check=True, capture_output=True,
+    )
+
+    # The CLI runs in its own process; the server must still see the bump
+    assert invalidation_bus.store.get("content") == before + 1
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from cache import InvalidationBus, LocalVersionStore, SQLiteVersionStore, VersionedCache
+
+
+@pytest.fixture(params=["local", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteVersionStore(str(tmp_path / "cachebus.db"))
+    return LocalVersionStore()
+
+
+class Counter:
+    """Cache factory that counts how often it was called"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+# ============================================================================
+# VERSION STORES
+# ============================================================================
+
+def test_versions_start_at_zero_and_bump_per_namespace(store):
+    assert store.get("content") == 0
+    assert store.bump("content") == 1
+    assert store.bump("content") == 2
+    assert store.get("content") == 2
+    assert store.get("categories") == 0
+
+
+def test_sqlite_stores_on_one_file_see_each_others_bumps(tmp_path):
+    path = str(tmp_path / "cachebus.db")
+    first, second = SQLiteVersionStore(path), SQLiteVersionStore(path)
+    first.bump("content")
+    assert second.bump("content") == 2
+    assert first.get("content") == 2
+
+
+# ============================================================================
+# INVALIDATION BUS
+# ============================================================================
+
+def test_reader_sees_bump_after_check_interval(tmp_path):
+    path = str(tmp_path / "cachebus.db")
+    writer = InvalidationBus(SQLiteVersionStore(path), check_interval=0.05)
+    reader = InvalidationBus(SQLiteVersionStore(path), check_interval=0.05)
+    assert reader.version("content") == 0
+
+    writer.invalidate("content")
+    # Within the interval the reader trusts its last read
+    assert reader.version("content") == 0
+    time.sleep(0.06)
+    assert reader.version("content") == 1
+
+
+def test_writer_sees_its_own_bump_immediately(store):
+    bus = InvalidationBus(store, check_interval=60)
+    assert bus.version("content") == 0
+    bus.invalidate("content", "categories")
+    assert bus.version("content") == 1
+    assert bus.version("categories") == 1
+
+
+# ============================================================================
+# VERSIONED CACHE
+# ============================================================================
+
+def test_cache_reuses_entries_until_namespace_is_bumped(store):
+    bus = InvalidationBus(store, check_interval=0)
+    cache = VersionedCache("content", bus=bus)
+    factory = Counter()
+
+    assert cache.get_or_set("page-1", factory) == 1
+    assert cache.get_or_set("page-1", factory) == 1
+
+    bus.invalidate("categories")
+    assert cache.get_or_set("page-1", factory) == 1
+
+    bus.invalidate("content")
+    assert cache.get_or_set("page-1", factory) == 2
+    assert factory.calls == 2
+
+
+def test_bump_from_another_worker_drops_cached_entries(tmp_path):
+    path = str(tmp_path / "cachebus.db")
+    cache = VersionedCache("content", bus=InvalidationBus(SQLiteVersionStore(path), check_interval=0))
+    other_worker = InvalidationBus(SQLiteVersionStore(path), check_interval=0)
+    factory = Counter()
+
+    cache.get_or_set("page-1", factory)
+    other_worker.invalidate("content")
+    assert cache.get_or_set("page-1", factory) == 2
+
+
+def test_cache_is_bounded_and_evicts_least_recently_used(store):
+    cache = VersionedCache("content", bus=InvalidationBus(store), max_entries=2)
+    cache.get_or_set("a", lambda: "a")
+    cache.get_or_set("b", lambda: "b")
+    # Reading "a" makes "b" the eviction candidate
+    cache.get_or_set("a", lambda: "stale")
+    cache.get_or_set("c", lambda: "c")
+
+    assert list(cache._entries) == ["a", "c"]
+    assert cache.get_or_set("b", lambda: "rebuilt") == "rebuilt"
+    assert len(cache._entries) == 2
+
+
+def test_clear_drops_everything(store):
+    cache = VersionedCache("content", bus=InvalidationBus(store))
+    factory = Counter()
+    cache.get_or_set("a", factory)
+    cache.clear()
+    assert cache.get_or_set("a", factory) == 2
@@ -0,0 +1,217 @@
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+import compression
+from compression import (
+    CompressionMiddleware,
+    PrecompressedStaticFiles,
+    SPAStaticFiles,
+    precompress_file,
+    precompress_tree,
+    select_encoding,
+)
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    (tmp_path / "index.html").write_text("<div id=root></div>")
+    (tmp_path / "static" / "js").mkdir(parents=True)
+    (tmp_path / "static" / "js" / "main.js").write_text("console.log(1)")
+    return tmp_path
+
+
+@pytest.fixture
+def client(build_dir, tmp_path_factory):
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    def ping():
+        return {"ok": True}
+
+    uploads = tmp_path_factory.mktemp("uploads")
+    app.mount("/uploads", PrecompressedStaticFiles(directory=uploads), name="uploads")
+    app.mount("/", SPAStaticFiles(directory=build_dir, html=True), name="frontend")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/", "/admin", "/collections", "/collections/3/"])
+def test_client_routes_fall_back_to_index(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.text == "<div id=root></div>"
+
+
+def test_files_are_served_as_is(client):
+    response = client.get("/static/js/main.js")
+    assert response.status_code == 200
+    assert response.text == "console.log(1)"
+
+
+@pytest.mark.parametrize("path", ["/static/js/missing.js", "/favicon.ico", "/api/missing", "/uploads/photos/x"])
+def test_missing_files_and_api_paths_still_404(client, path):
+    assert client.get(path).status_code == 404
+
+
+def test_fallback_only_for_get_and_head(client):
+    assert client.head("/admin").status_code == 200
+    assert client.post("/admin").status_code == 405
+
+
+def test_api_routes_take_precedence(client):
+    assert client.get("/api/ping").json() == {"ok": True}
+
+
+def test_fresh_sidecar_is_served_when_accepted(build_dir):
+    payload = b"console.log(1)" * 200
+    (build_dir / "static" / "js" / "main.js").write_bytes(payload)
+    (build_dir / "static" / "js" / "main.js.gz").write_bytes(gzip.compress(payload))
+    app = FastAPI()
+    app.mount("/", SPAStaticFiles(directory=build_dir, html=True), name="frontend")
+
+    response = TestClient(app).get("/static/js/main.js", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.content == payload
+
+
+def test_select_encoding_honours_q_values():
+    assert select_encoding("gzip;q=0.5, br", ["br", "gzip"]) == "br"
+    assert select_encoding("gzip, br;q=0", ["br", "gzip"]) == "gzip"
+    assert select_encoding("identity", ["br", "gzip"]) is None
+
+
+# ============================================================================
+# COMPRESSION MIDDLEWARE
+# ============================================================================
+
+BIG_TEXT = "photostudio " * 500
+
+
+@pytest.fixture
+def compressed_client():
+    app = FastAPI()
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse(BIG_TEXT)
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\0" * 4096, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter(["line\n"] * 300), media_type="application/x-ndjson")
+
+    @app.get("/encoded")
+    def encoded():
+        body = gzip.compress(BIG_TEXT.encode())
+        return Response(body, media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def test_large_allowlisted_response_is_compressed(compressed_client):
+    response = compressed_client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    # Content-Length describes the compressed body actually sent
+    assert int(response.headers["Content-Length"]) < len(BIG_TEXT)
+    assert response.text == BIG_TEXT
+
+
+def test_response_below_minimum_size_is_passed_through(compressed_client):
+    response = compressed_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Content-Length"] == "4"
+
+
+def test_content_type_outside_allowlist_is_passed_through(compressed_client):
+    response = compressed_client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Content-Length"] == str(4 + 4096)
+
+
+def test_client_without_accept_encoding_gets_identity(compressed_client):
+    response = compressed_client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.text == BIG_TEXT
+
+
+def test_streaming_response_is_compressed_without_content_length(compressed_client):
+    response = compressed_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert response.text == "line\n" * 300
+
+
+def test_already_encoded_response_is_not_compressed_again(compressed_client):
+    response = compressed_client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == BIG_TEXT
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="Brotli not installed")
+def test_brotli_is_preferred_when_accepted(compressed_client):
+    response = compressed_client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.text == BIG_TEXT
+
+
+# ============================================================================
+# PRECOMPRESSION
+# ============================================================================
+
+def test_precompress_file_writes_smaller_sidecars(tmp_path):
+    path = tmp_path / "main.js"
+    path.write_text("console.log('photostudio');\n" * 200)
+
+    written = precompress_file(path, minimum_size=1024)
+
+    assert path.with_name("main.js.gz") in written
+    assert gzip.decompress(path.with_name("main.js.gz").read_bytes()) == path.read_bytes()
+
+
+def test_precompress_file_skips_sidecars_that_are_not_smaller(tmp_path):
+    path = tmp_path / "noise.js"
+    path.write_bytes(os.urandom(4096))
+    stale = path.with_name("noise.js.gz")
+    stale.write_bytes(b"stale")
+
+    assert precompress_file(path, minimum_size=1024) == []
+    # A leftover sidecar from an older build is removed rather than served
+    assert not stale.exists()
+
+
+def test_precompress_file_skips_small_and_non_compressible_files(tmp_path):
+    small = tmp_path / "small.css"
+    small.write_text("body{}")
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(b"\xff\xd8" + b"\0" * 8192)
+
+    assert precompress_file(small, minimum_size=1024) == []
+    assert precompress_file(photo, minimum_size=1024) == []
+
+
+def test_precompress_tree_walks_subdirectories(tmp_path):
+    (tmp_path / "static" / "css").mkdir(parents=True)
+    (tmp_path / "index.html").write_text("<p>photostudio</p>" * 200)
+    (tmp_path / "static" / "css" / "main.css").write_text("a{color:red}" * 200)
+    (tmp_path / "static" / "logo.png").write_bytes(b"\0" * 8192)
+
+    written = precompress_tree(tmp_path, minimum_size=1024)
+
+    assert {path.name for path in written if path.suffix == ".gz"} == {"index.html.gz", "main.css.gz"}
+    # Running again only rewrites sidecars, never compresses them
+    assert sorted(precompress_tree(tmp_path, minimum_size=1024)) == sorted(written)
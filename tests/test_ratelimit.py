@@ -0,0 +1,154 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import ratelimit
+from ratelimit import MemoryBucketStore, RateLimit, SQLiteBucketStore, get_client_ip
+
+
+def make_request(peer="198.51.100.7", forwarded=None):
+    headers = []
+    if forwarded is not None:
+        headers.append((b"x-forwarded-for", forwarded.encode()))
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/content/1/like",
+        "headers": headers,
+        "client": (peer, 50000),
+    })
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteBucketStore(str(tmp_path / "ratelimit.db"), max_buckets=100)
+    return MemoryBucketStore(max_buckets=100)
+
+
+# ============================================================================
+# BUCKET STORES
+# ============================================================================
+
+def test_take_allows_up_to_capacity_then_denies(store):
+    for _ in range(3):
+        assert store.take("k", capacity=3, rate=0.5, now=1000.0) == 0.0
+    # Empty bucket: one token at 0.5/s is two seconds away
+    assert store.take("k", capacity=3, rate=0.5, now=1000.0) == pytest.approx(2.0)
+
+
+def test_take_refills_over_time(store):
+    for _ in range(2):
+        store.take("k", capacity=2, rate=1.0, now=1000.0)
+    assert store.take("k", capacity=2, rate=1.0, now=1000.5) == pytest.approx(0.5)
+    assert store.take("k", capacity=2, rate=1.0, now=1001.0) == 0.0
+
+
+def test_take_refill_is_capped_at_capacity(store):
+    store.take("k", capacity=2, rate=1.0, now=1000.0)
+    # A long idle period must not bank more than `capacity` tokens
+    for _ in range(2):
+        assert store.take("k", capacity=2, rate=1.0, now=5000.0) == 0.0
+    assert store.take("k", capacity=2, rate=1.0, now=5000.0) > 0
+
+
+def test_buckets_are_independent_per_key(store):
+    store.take("a", capacity=1, rate=0.1, now=1000.0)
+    assert store.take("a", capacity=1, rate=0.1, now=1000.0) > 0
+    assert store.take("b", capacity=1, rate=0.1, now=1000.0) == 0.0
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryBucketStore(max_buckets=2)
+    store.take("a", capacity=1, rate=0.1, now=1000.0)
+    store.take("b", capacity=1, rate=0.1, now=1000.0)
+    # Touching "a" makes "b" the eviction candidate
+    store.take("a", capacity=1, rate=0.1, now=1001.0)
+    store.take("c", capacity=1, rate=0.1, now=1002.0)
+
+    assert list(store._buckets) == ["a", "c"]
+    # "a" kept its empty bucket, "b" starts over with a full one
+    assert store.take("a", capacity=1, rate=0.1, now=1003.0) > 0
+    assert store.take("b", capacity=1, rate=0.1, now=1003.0) == 0.0
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first, second = SQLiteBucketStore(path), SQLiteBucketStore(path)
+    assert first.take("k", capacity=1, rate=0.1, now=1000.0) == 0.0
+    assert second.take("k", capacity=1, rate=0.1, now=1000.0) > 0
+
+
+def test_sqlite_store_evicts_oldest_buckets(tmp_path):
+    store = SQLiteBucketStore(str(tmp_path / "ratelimit.db"), max_buckets=2)
+    conn = store._connection()
+    for now, key in enumerate(["a", "b", "c"]):
+        store.take(key, capacity=1, rate=0.1, now=1000.0 + now)
+    store._evict(conn)
+
+    keys = {row[0] for row in conn.execute("SELECT key FROM rate_limit_buckets")}
+    assert keys == {"b", "c"}
+
+
+# ============================================================================
+# CLIENT ADDRESS
+# ============================================================================
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peer(monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXIES", {"10.0.0.1"})
+    request = make_request(peer="198.51.100.7", forwarded="6.6.6.6")
+    assert get_client_ip(request) == "198.51.100.7"
+
+
+def test_client_ip_uses_forwarded_for_from_trusted_peer(monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXIES", {"10.0.0.1"})
+    request = make_request(peer="10.0.0.1", forwarded="203.0.113.9")
+    assert get_client_ip(request) == "203.0.113.9"
+
+
+def test_client_ip_ignores_spoofed_leftmost_entry(monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXIES", {"10.0.0.1"})
+    request = make_request(peer="10.0.0.1", forwarded="6.6.6.6, 203.0.113.9")
+    assert get_client_ip(request) == "203.0.113.9"
+
+
+def test_client_ip_skips_chained_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXIES", {"10.0.0.1", "10.0.0.2"})
+    request = make_request(peer="10.0.0.1", forwarded="6.6.6.6, 203.0.113.9, 10.0.0.2")
+    assert get_client_ip(request) == "203.0.113.9"
+
+
+def test_client_ip_falls_back_to_peer_without_forwarded_for(monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXIES", {"10.0.0.1"})
+    assert get_client_ip(make_request(peer="10.0.0.1")) == "10.0.0.1"
+
+
+# ============================================================================
+# DEPENDENCY
+# ============================================================================
+
+def test_rate_limit_raises_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(ratelimit.time, "time", lambda: 1000.0)
+    limit = RateLimit("like", capacity=2, refill_per_second=0.2, store=MemoryBucketStore())
+    request = make_request()
+
+    limit(request)
+    limit(request)
+    with pytest.raises(HTTPException) as exc_info:
+        limit(request)
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "6"
+
+
+def test_rate_limit_keys_by_scope_and_client():
+    store = MemoryBucketStore()
+    like = RateLimit("like", capacity=1, refill_per_second=0.01, store=store)
+    rate = RateLimit("rate", capacity=1, refill_per_second=0.01, store=store)
+
+    like(make_request(peer="198.51.100.7"))
+    # Other scopes and other clients have their own buckets
+    rate(make_request(peer="198.51.100.7"))
+    like(make_request(peer="198.51.100.8"))
+    with pytest.raises(HTTPException):
+        like(make_request(peer="198.51.100.7"))
@@ -0,0 +1,118 @@
+import io
+import json
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import bulk
+from cache import invalidation_bus
+from models import Content, Like, Rating
+from recommendations import RecommendationIndex
+
+
+@pytest.fixture
+def items(db):
+    items = [
+        Content(title=f"Item {n}", file_path=f"uploads/photos/{n}.jpg", file_type="photo", category="paisagem")
+        for n in range(4)
+    ]
+    db.add_all(items)
+    db.commit()
+    return [item.id for item in items]
+
+
+def vote(db, *pairs):
+    for ip, content_id in pairs:
+        db.add(Like(content_id=content_id, ip_address=ip))
+    db.commit()
+
+
+def test_items_liked_together_are_related(db, items):
+    a, b, c, d = items
+    vote(db, ("1.1.1.1", a), ("1.1.1.1", b), ("2.2.2.2", a), ("2.2.2.2", b), ("3.3.3.3", c), ("3.3.3.3", d))
+    index = RecommendationIndex()
+    index.refresh(db)
+
+    assert index.related(a) == [b]
+    assert index.related(c) == [d]
+
+
+def test_incremental_refresh_matches_full_rebuild(db, items):
+    a, b, c, d = items
+    vote(db, ("1.1.1.1", a), ("1.1.1.1", b), ("2.2.2.2", b), ("2.2.2.2", c))
+    incremental = RecommendationIndex()
+    incremental.refresh(db)
+
+    vote(db, ("3.3.3.3", a), ("3.3.3.3", d))
+    db.add(Rating(content_id=c, score=5, ip_address="1.1.1.1"))
+    db.commit()
+    assert incremental.refresh(db) > 0
+
+    full = RecommendationIndex()
+    full.refresh(db)
+    assert incremental._top == full._top
+
+
+def test_failed_refresh_does_not_lose_votes(db, items, monkeypatch):
+    a, b, c, d = items
+    vote(db, ("1.1.1.1", a), ("1.1.1.1", b))
+    index = RecommendationIndex()
+    index.refresh(db)
+
+    vote(db, ("2.2.2.2", c), ("2.2.2.2", d))
+    execute = db.execute
+
+    def ratings_query_fails(statement, *args, **kwargs):
+        if "ratings" in str(statement):
+            raise OperationalError(str(statement), {}, Exception("database is locked"))
+        return execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", ratings_query_fails)
+    with pytest.raises(OperationalError):
+        index.refresh(db)
+    assert index.related(c) == []
+
+    monkeypatch.setattr(db, "execute", execute)
+    index.refresh(db)
+    assert index.related(c) == [d]
+    assert index.related(a) == [b]
+
+
+def test_failed_recompute_forces_full_rebuild(db, items, monkeypatch):
+    a, b, c, d = items
+    vote(db, ("1.1.1.1", a), ("1.1.1.1", b))
+    index = RecommendationIndex()
+    index.refresh(db)
+
+    vote(db, ("2.2.2.2", c), ("2.2.2.2", d))
+    recompute = index._recompute
+
+    def broken(touched):
+        raise MemoryError
+
+    monkeypatch.setattr(index, "_recompute", broken)
+    with pytest.raises(MemoryError):
+        index.refresh(db)
+
+    # Watermarks already moved past the new likes; only a rebuild picks them up again
+    monkeypatch.setattr(index, "_recompute", recompute)
+    index.refresh(db)
+    assert index.related(c) == [d]
+
+
+def test_imported_votes_below_watermark_trigger_rebuild(db, items):
+    a, b, c, d = items
+    db.add_all([Like(id=10, content_id=a, ip_address="1.1.1.1"), Like(id=11, content_id=b, ip_address="1.1.1.1")])
+    db.commit()
+    index = RecommendationIndex()
+    index.refresh(db)
+
+    # Restoring an export brings back older ids the watermark has already passed
+    rows = [{"id": 3, "content_id": c, "ip_address": "2.2.2.2"}, {"id": 4, "content_id": d, "ip_address": "2.2.2.2"}]
+    bulk.import_table(db, "likes", io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode()))
+    assert index.refresh(db) == 0
+    invalidation_bus.invalidate(*bulk.IMPORT_INVALIDATES)
+
+    assert index.refresh(db) > 0
+    assert index.related(c) == [d]
+    assert index.related(a) == [b]
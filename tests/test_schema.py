@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+def test_concurrent_create_schema_on_fresh_database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    env = dict(os.environ, DATABASE_URL=url, SQL_ECHO="false")
+    # Same boot path as N workers starting together against an empty database
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", "import database; database.create_schema()"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stderr=subprocess.PIPE,
+        )
+        for _ in range(6)
+    ]
+    for worker in workers:
+        _, stderr = worker.communicate(timeout=60)
+        assert worker.returncode == 0, stderr.decode()
+
+    tables = set(inspect(create_engine(url)).get_table_names())
+    assert {"users", "content", "likes", "ratings", "collections"} <= tables
+
+
+def test_prepare_schema_creates_tables_once_for_workers(tmp_path):
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    env = dict(os.environ, DATABASE_URL=url, SQL_ECHO="false", AUTO_CREATE_SCHEMA="true")
+    script = (
+        "import os, workers\n"
+        "workers.prepare_schema()\n"
+        "print(os.environ['AUTO_CREATE_SCHEMA'])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+    assert output.strip() == "false"
+    assert "content" in inspect(create_engine(url)).get_table_names()